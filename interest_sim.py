@@ -1,14 +1,30 @@
 import typing
 import logging
-import csv
 import argparse
-from dataclasses import dataclass
+import functools
+from dataclasses import asdict, dataclass
+
+import numba
+import numpy as np
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 
+MAX_ITERATIONS = 1000  # Safeguard for infinite loops
+
 
 @dataclass
+class SimulationParams:
+    """Input parameters of a simulation, echoed into the CSV header."""
+
+    principal: float
+    repayment: float
+    downpayment: float
+    annual_interest_rate: float
+    months: int
+
+
+@dataclass(slots=True, frozen=True)
 class MonthlyResult:
     month: int
     interest: float
@@ -18,9 +34,96 @@ class MonthlyResult:
     interest_percentage: float
 
 
-def calculate_monthly_interest(balance: float, monthly_interest_rate: float) -> float:
-    """Calculate the interest for the current balance."""
-    return balance * monthly_interest_rate
+@dataclass
+class SimulationResults:
+    """Simulation output in a column-per-field (struct-of-arrays) layout."""
+
+    month: np.ndarray
+    interest: np.ndarray
+    balance: np.ndarray
+    accumulated_interest: np.ndarray
+    total_paid: np.ndarray
+    interest_percentage: np.ndarray
+
+    def __len__(self) -> int:
+        return self.month.size
+
+    def rows(self) -> typing.Iterator[MonthlyResult]:
+        """Iterate over the results one MonthlyResult per month."""
+        for values in zip(
+            self.month,
+            self.interest,
+            self.balance,
+            self.accumulated_interest,
+            self.total_paid,
+            self.interest_percentage,
+        ):
+            yield MonthlyResult(*values)
+
+
+@functools.lru_cache(maxsize=64)
+def _growth_vector(monthly_interest_rate: float, months: int) -> np.ndarray:
+    """Return (1 + r)**n for n = 1..months, cached across simulations.
+
+    Scenario sweeps rerun the simulation with the same rate and varying
+    principal/repayment; caching skips the pow chain on every run after
+    the first. Callers must not mutate the returned array.
+    """
+    return (1.0 + monthly_interest_rate) ** np.arange(1, months + 1)
+
+
+@numba.njit(cache=True, fastmath=True)
+def _simulate_core(
+    principal: float,
+    repayment: float,
+    downpayment: float,
+    monthly_interest_rate: float,
+    max_iter: int,
+) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Run the month-by-month simulation as a compiled scalar loop.
+
+    Returns the per-month interest, balance and total-paid columns,
+    truncated to the number of months actually simulated.
+    """
+    interests = np.empty(max_iter, dtype=np.float64)
+    balances = np.empty(max_iter, dtype=np.float64)
+    total_paid = np.empty(max_iter, dtype=np.float64)
+
+    balance = principal - downpayment
+    paid = 0.0
+    count = 0
+
+    # The balance only decreases when the repayment covers the interest,
+    # so checking the first month once is equivalent to checking every
+    # month and keeps the guard out of the loop.
+    if balance > 0 and repayment <= monthly_interest_rate * balance:
+        raise ValueError(
+            "Repayment is too low to cover the monthly interest. Balance will grow indefinitely."
+        )
+
+    while balance > 0 and count < max_iter:
+        interest = balance * monthly_interest_rate
+        balance += interest - repayment
+        paid += repayment
+
+        # Avoid negative balance. The branchless form lowers to a
+        # conditional move under fastmath instead of a branch that is
+        # only ever taken on the final month.
+        overpay = -balance if balance < 0.0 else 0.0
+        paid -= overpay
+        balance += overpay
+
+        interests[count] = interest
+        balances[count] = balance
+        total_paid[count] = paid
+        count += 1
+
+    if balance > 0:
+        raise RuntimeError(
+            "Simulation exceeded maximum iterations. Check your inputs."
+        )
+
+    return interests[:count], balances[:count], total_paid[:count]
 
 
 def simulate_interest(
@@ -31,7 +134,7 @@ def simulate_interest(
     months: int,
     export_to_csv: bool = False,
     csv_filename: str = "simulation_results.csv",
-) -> typing.List[MonthlyResult]:
+) -> SimulationResults:
     """
     Simulate interest calculation over time.
 
@@ -45,7 +148,7 @@ def simulate_interest(
         csv_filename: Name of the CSV file to export results.
 
     Returns:
-        A list of MonthlyResult objects containing the simulation results.
+        A SimulationResults holding one array per column of the simulation.
     """
     if principal <= 0:
         raise ValueError("Principal must be greater than zero.")
@@ -57,133 +160,203 @@ def simulate_interest(
         raise ValueError(
             "Repayment must be positive and interest rate cannot be negative."
         )
+    if months < 0:
+        raise ValueError("Months cannot be negative.")
 
-    accumulated_interest = 0
-    total_paid = 0
     balance = principal - downpayment
     monthly_interest_rate = annual_interest_rate / 12
-    month_counter = 0
-    results = []
-
-    MAX_ITERATIONS = 1000  # Safeguard for infinite loops
-
-    while months == 0 or month_counter < months:
-        if balance <= 0:
-            break
 
+    if months > 0 and balance <= 0:
+        month = np.empty(0, dtype=np.int64)
+        interests = balances = accumulated = total_paid = np.empty(0)
+    elif months > 0:
         if repayment <= monthly_interest_rate * balance:
             raise ValueError(
                 "Repayment is too low to cover the monthly interest. Balance will grow indefinitely."
             )
 
-        month_counter += 1
-        interest = calculate_monthly_interest(balance, monthly_interest_rate)
-        balance += interest - repayment
-        accumulated_interest += interest
-        total_paid += repayment
-
-        # Avoid negative balance
-        if balance < 0:
-            total_paid += balance  # Adjust final payment
-            balance = 0
-
-        results.append(
-            MonthlyResult(
-                month=month_counter,
-                interest=interest,
-                balance=balance,
-                accumulated_interest=accumulated_interest,
-                total_paid=total_paid,
-                interest_percentage=(accumulated_interest / total_paid * 100)
-                if total_paid > 0
-                else 0,
+        # Closed-form amortization: the recurrence
+        #   balance_n = balance_{n-1} * (1 + r) - repayment
+        # has the solution
+        #   balance_n = B0 * (1+r)^n - repayment * ((1+r)^n - 1) / r
+        # so every month can be computed in one vectorized pass.
+        horizon = min(months, MAX_ITERATIONS)
+        n = np.arange(1, horizon + 1)
+        growth = _growth_vector(monthly_interest_rate, horizon)
+        if monthly_interest_rate > 0:
+            balances = (
+                balance * growth
+                - repayment * (growth - 1.0) / monthly_interest_rate
             )
-        )
+        else:
+            balances = balance - repayment * n
+        interests = np.empty_like(balances)
+        interests[0] = balance * monthly_interest_rate
+        interests[1:] = balances[:-1] * monthly_interest_rate
+        accumulated = np.cumsum(interests)
+        total_paid = float(repayment) * n
 
-        if month_counter > MAX_ITERATIONS:
+        # Truncate at the first month the loan is paid off and adjust the
+        # final payment so the balance never goes negative. A loan that is
+        # still open past the iteration cap is rejected, matching the
+        # iterative path.
+        payoff = np.searchsorted(-balances, 0.0, side="left")
+        if payoff >= horizon and months > MAX_ITERATIONS:
             raise RuntimeError(
                 "Simulation exceeded maximum iterations. Check your inputs."
             )
+        if payoff < horizon:
+            n = n[: payoff + 1]
+            interests = interests[: payoff + 1]
+            balances = balances[: payoff + 1]
+            accumulated = accumulated[: payoff + 1]
+            total_paid = total_paid[: payoff + 1]
+            total_paid[-1] += balances[-1]  # Adjust final payment
+            balances[-1] = 0.0
 
-        if export_to_csv:
-            export_results_to_csv(
-                results,
-                csv_filename,
-                principal,
-                repayment,
-                downpayment,
-                annual_interest_rate,
-                months,
-            )
+        month = n
+    else:
+        interests, balances, total_paid = _simulate_core(
+            principal, repayment, downpayment, monthly_interest_rate, MAX_ITERATIONS
+        )
+        accumulated = np.cumsum(interests)
+        month = np.arange(1, interests.size + 1)
+
+    interest_percentage = np.zeros_like(total_paid)
+    np.divide(
+        accumulated, total_paid, out=interest_percentage, where=total_paid > 0
+    )
+    interest_percentage *= 100.0
+    results = SimulationResults(
+        month=month,
+        interest=interests,
+        balance=balances,
+        accumulated_interest=accumulated,
+        total_paid=total_paid,
+        interest_percentage=interest_percentage,
+    )
+
+    if export_to_csv:
+        export_results_to_csv(
+            results,
+            csv_filename,
+            SimulationParams(
+                principal, repayment, downpayment, annual_interest_rate, months
+            ),
+        )
 
     return results
 
 
+def simulate_batch(
+    principals: np.ndarray,
+    repayments: np.ndarray,
+    downpayments: np.ndarray,
+    annual_interest_rates: np.ndarray,
+    months: int,
+) -> np.ndarray:
+    """
+    Simulate many loan scenarios at once with the closed-form schedule.
+
+    Args:
+        principals: Initial loan amounts, one per scenario.
+        repayments: Monthly repayment amounts, one per scenario.
+        downpayments: Initial payments, one per scenario.
+        annual_interest_rates: Annual interest rates as decimals, one per
+            scenario.
+        months: Number of months to simulate. Must be positive.
+
+    Returns:
+        A (scenarios, months) array of end-of-month balances, clamped at
+        zero once a loan is paid off.
+    """
+    if months <= 0:
+        raise ValueError("Months must be positive for batch simulation.")
+
+    principals = np.asarray(principals, dtype=np.float64)
+    repayments = np.asarray(repayments, dtype=np.float64)
+    downpayments = np.asarray(downpayments, dtype=np.float64)
+    rates = np.asarray(annual_interest_rates, dtype=np.float64)
+
+    r = rates[:, None] / 12
+    initial = (principals - downpayments)[:, None]
+    n = np.arange(1, months + 1)[None, :]
+    growth = (1.0 + r) ** n
+    # Zero-rate scenarios take the linear branch; the masked divide in the
+    # other branch is discarded for them.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        balances = np.where(
+            r > 0,
+            initial * growth - repayments[:, None] * (growth - 1.0) / r,
+            initial - repayments[:, None] * n,
+        )
+    return np.maximum(balances, 0.0)
+
+
 def export_results_to_csv(
-    results: typing.List[MonthlyResult],
+    results: SimulationResults,
     filename: str,
-    principal: float,
-    repayment: float,
-    downpayment: float,
-    annual_interest_rate: float,
-    months: int,
+    params: SimulationParams,
 ) -> None:
     """Export the simulation results to a CSV file."""
-    with open(filename, mode="w", newline="") as csv_file:
-        writer = csv.writer(csv_file)
-
-        # Add input parameters as the first row
-        writer.writerow(
-            [
-                "Input Parameters",
-                f"Principal: {principal}",
-                f"Repayment: {repayment}",
-                f"Downpayment: {downpayment}",
-                f"Annual Interest Rate: {annual_interest_rate}",
-                f"Months: {months}",
-            ]
+    data = np.column_stack(
+        [
+            results.month,
+            results.interest,
+            results.balance,
+            results.accumulated_interest,
+            results.total_paid,
+            results.interest_percentage,
+        ]
+    )
+    with open(filename, mode="w", newline="", buffering=1 << 16) as csv_file:
+        # Add input parameters as the first row, then a blank separator
+        csv_file.write(
+            "Input Parameters,"
+            + ",".join(
+                f"{key.replace('_', ' ').title()}: {value}"
+                for key, value in asdict(params).items()
+            )
+            + "\r\n\r\n"
         )
-
-        # Add a blank row for separation
-        writer.writerow([])
-
-        # Add headers for the results
-        writer.writerow(
-            [
-                "Month",
-                "Interest",
-                "Balance",
-                "Accumulated Interest",
-                "Total Paid",
-                "Interest Percentage",
-            ]
+        # np.savetxt formats and writes the whole matrix in a C loop.
+        # \r\n keeps the RFC-4180 line endings csv.writer used to emit.
+        np.savetxt(
+            csv_file,
+            data,
+            fmt=["%d", "%.2f", "%.2f", "%.2f", "%.2f", "%.2f"],
+            delimiter=",",
+            newline="\r\n",
+            header="Month,Interest,Balance,Accumulated Interest,Total Paid,Interest Percentage",
+            comments="",
         )
-
-        # Write the simulation results
-        for result in results:
-            writer.writerow(
-                [
-                    result.month,
-                    f"{result.interest:.2f}",
-                    f"{result.balance:.2f}",
-                    f"{result.accumulated_interest:.2f}",
-                    f"{result.total_paid:.2f}",
-                    f"{result.interest_percentage:.2f}",
-                ]
-            )
-    logging.info(f"Results exported to {filename}")
+    logging.info("Results exported to %s", filename)
 
 
-def log_results(results: typing.List[MonthlyResult]) -> None:
+def log_results(results: SimulationResults) -> None:
     """Log the results of the simulation."""
-    for result in results:
-        logging.info(f"Month: {result.month}")
-        logging.info(f"Interest: {result.interest:.2f}")
-        logging.info(f"Remaining Balance: {result.balance:.2f}")
-        logging.info(f"Accumulated Interest Paid: {result.accumulated_interest:.2f}")
-        logging.info(
-            f"Total Paid: {result.total_paid:.2f} | Interest: {result.interest_percentage:.2f}%\n"
+    logger = logging.getLogger()
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    # Emit one record for the whole run instead of five per month.
+    report = "\n".join(
+        f"Month: {month}\n"
+        f"Interest: {interest:.2f}\n"
+        f"Remaining Balance: {balance:.2f}\n"
+        f"Accumulated Interest Paid: {acc:.2f}\n"
+        f"Total Paid: {paid:.2f} | Interest: {pct:.2f}%\n"
+        for month, interest, balance, acc, paid, pct in zip(
+            results.month,
+            results.interest,
+            results.balance,
+            results.accumulated_interest,
+            results.total_paid,
+            results.interest_percentage,
         )
+    )
+    if report:
+        logger.info(report)
 
 
 if __name__ == "__main__":
@@ -223,9 +396,17 @@ if __name__ == "__main__":
         default="simulation_results.csv",
         help="Name of the CSV file to export results.",
     )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only log warnings and errors.",
+    )
 
     args = parser.parse_args()
 
+    if args.quiet:
+        logging.getLogger().setLevel(logging.WARNING)
+
     logging.info("Starting interest calculation...")
     try:
         results = simulate_interest(
@@ -239,8 +420,8 @@ if __name__ == "__main__":
         )
         log_results(results)
     except ValueError as e:
-        logging.error(f"Input error: {e}")
+        logging.error("Input error: %s", e)
     except RuntimeError as e:
-        logging.error(f"Simulation error: {e}")
+        logging.error("Simulation error: %s", e)
     except Exception as e:
-        logging.error(f"Unexpected error: {e}")
+        logging.error("Unexpected error: %s", e)